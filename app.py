@@ -21,6 +21,7 @@ import streamlit as st
 import io
 import os
 import math
+import threading
 import numpy as np
 from PIL import Image
 import tempfile
@@ -34,25 +35,36 @@ try:
 except ImportError:
     DEPENDENCIES_AVAILABLE = False
 
+# Numba is optional; without it glyphs are blitted with NumPy slices
+try:
+    from numba import njit, prange, set_num_threads, threading_layer, config as numba_config
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+@st.cache_resource
 def load_font_bytes(path):
-    """Load font file as bytes."""
+    """Load font file as bytes, read from disk once per process."""
     with open(path, 'rb') as f:
         return f.read()
 
-def hb_shape(text, font_bytes, script='taml', lang='ta', direction='LTR', upem=None, px_size=16):
-    """Shape Tamil text using HarfBuzz for proper glyph positioning."""
-    # Create HB objects
-    blob = hb.Blob(font_bytes)
+@st.cache_resource(max_entries=64)
+def make_hb_font(font_path, px_size=16):
+    """Build a HarfBuzz font scaled to px_size once per (font, size) and reuse it."""
+    blob = hb.Blob(load_font_bytes(font_path))
     face = hb.Face(blob)
     font = hb.Font(face)
 
     # Let HB use OpenType funcs for metrics/placement
     hb.ot_font_set_funcs(font)
 
-    # Scale HB font roughly to pixel size: map units/em to pixels
-    upem = upem or face.upem
+    # Scale HB font to pixel size in 26.6 fixed point
     font.scale = (px_size * 64, px_size * 64)
+    return font
 
+def shape_with(font, text, script='taml', lang='ta', direction='LTR'):
+    """Shape Tamil text with a prepared HarfBuzz font for proper glyph positioning."""
+    # A fresh buffer per call keeps a shared font safe across sessions
     buf = hb.Buffer()
     buf.add_str(text)
     buf.guess_segment_properties()
@@ -62,32 +74,389 @@ def hb_shape(text, font_bytes, script='taml', lang='ta', direction='LTR', upem=N
 
     features = {"kern": True, "liga": True}
     hb.shape(font, buf, features)
-    infos = buf.glyph_infos
-    positions = buf.glyph_positions
-    return infos, positions, face, font
-
-def unpack_mono_bitmap(ft_bitmap):
-    """Unpack FreeType monochrome bitmap to numpy array."""
-    width, rows, pitch = ft_bitmap.width, ft_bitmap.rows, ft_bitmap.pitch
-    buffer = ft_bitmap.buffer
-    out = np.zeros((rows, width), dtype=np.uint8)
-    for y in range(rows):
-        rowstart = y * pitch
-        outy = out[y]
-        for byte_index in range(pitch):
-            b = buffer[rowstart + byte_index]
-            for bit in range(min(8, width - byte_index * 8)):
-                mask = 1 << (7 - bit)
-                outy[byte_index * 8 + bit] = 1 if (b & mask) else 0
-    return out
+    return buf.glyph_infos, buf.glyph_positions
+
+@st.cache_data(max_entries=256)
+def shape_cached(text, font_path, px_size=16, script='taml', lang='ta', direction='LTR'):
+    """
+    Shape text with HarfBuzz and cache the result across Streamlit reruns.
+
+    Returns plain int32 arrays (glyph ids, x advances, x offsets, y offsets) in
+    26.6 fixed point rather than HarfBuzz objects, so they can be cached.
+    """
+    font = make_hb_font(font_path, px_size)
+    infos, positions = shape_with(font, text, script=script, lang=lang, direction=direction)
+    count = len(infos)
+    gids = np.fromiter((info.codepoint for info in infos), dtype=np.int32, count=count)
+    x_advances = np.fromiter((pos.x_advance for pos in positions), dtype=np.int32, count=count)
+    x_offsets = np.fromiter((pos.x_offset for pos in positions), dtype=np.int32, count=count)
+    y_offsets = np.fromiter((pos.y_offset for pos in positions), dtype=np.int32, count=count)
+    return gids, x_advances, x_offsets, y_offsets
+
+def bitmap_rows(ft_bitmap):
+    """
+    View a FreeType bitmap buffer as a (rows, pitch) uint8 array without copying.
+
+    freetype-py's Bitmap.buffer builds a Python list element by element; this
+    wraps the underlying C buffer instead. The view is only valid until the
+    glyph slot is reused, so callers must copy or convert before the next load.
+    """
+    rows, pitch = ft_bitmap.rows, ft_bitmap.pitch
+    if rows == 0 or pitch == 0:
+        return np.zeros((rows, abs(pitch)), dtype=np.uint8)
+    return np.ctypeslib.as_array(ft_bitmap._FT_Bitmap.buffer, shape=(rows, pitch))
+
+def mono_bitmap_bits(ft_bitmap):
+    """
+    Copy a FreeType monochrome bitmap as packed rows of ceil(width / 8) bytes.
+
+    FreeType mono rows are already packed MSB-first, the canvas layout, so
+    only the pitch padding is trimmed and stray bits past width are cleared.
+    """
+    width = ft_bitmap.width
+    bits = bitmap_rows(ft_bitmap)[:, :(width + 7) // 8].copy()
+    if width % 8:
+        bits[:, -1] &= (0xFF << (8 - width % 8)) & 0xFF
+    return bits
+
+def gray_bitmap(ft_bitmap):
+    """Copy a FreeType 8-bit grayscale bitmap, trimmed to its width, as a numpy array."""
+    return bitmap_rows(ft_bitmap)[:, :ft_bitmap.width].copy()
+
+@st.cache_resource
+def get_ft_face(font_path):
+    """Open a FreeType face once per font file and share it across reruns."""
+    return freetype.Face(font_path)
+
+@st.cache_resource
+def ft_lock():
+    """
+    Process-wide lock guarding the shared FreeType faces.
+
+    FreeType faces are not thread-safe and Streamlit serves sessions from
+    several threads. Each rerun executes the script in a fresh module, so the
+    lock is kept in cache_resource alongside the faces, not at module level.
+    """
+    return threading.Lock()
+
+@st.cache_resource(max_entries=64)
+def glyph_atlas(font_path, px_size):
+    """
+    Per-(font, size) glyph atlas shared across reruns and sessions.
+
+    Holds the FreeType size metrics in pixels and a dict of rasterized glyphs
+    that render_glyph fills lazily, keyed by (gid, mode) where mode is 'mono'
+    or 'gray'. Grayscale coverage is stored once per glyph, so moving the
+    threshold slider does not add entries.
+    """
+    with ft_lock():
+        ft_face = get_ft_face(font_path)
+        ft_face.set_char_size(0, px_size * 64, 72, 72)
+        size = ft_face.size
+        return {
+            "font_path": font_path,
+            "px_size": px_size,
+            "ascender": size.ascender / 64.0,
+            "descender": size.descender / 64.0,
+            "height": size.height / 64.0,
+            "glyphs": {},
+        }
+
+def render_glyph(atlas, gid, threshold=None):
+    """
+    Rasterize a single glyph to packed 1-bit rows, caching it in the given glyph atlas.
+
+    With threshold=None the glyph goes through FreeType's hinted monochrome
+    rasterizer; otherwise it is rendered antialiased and every gray level at or
+    above threshold (1-255) becomes a lit pixel. The atlas keeps the gray
+    coverage, so the threshold is applied on each lookup.
+
+    Returns:
+        tuple: (bitmap_left, bitmap_top, width, bits) where bits is a read-only
+        uint8 array of shape (rows, ceil(width / 8)) packed MSB-first, with
+        zeroed padding bits
+    """
+    glyphs = atlas["glyphs"]
+    key = (gid, 'mono' if threshold is None else 'gray')
+    glyph = glyphs.get(key)
+    if glyph is None:
+        # Size, load and store under one lock so no other session can resize the
+        # shared face mid-glyph and leave a wrong-size bitmap in the atlas.
+        with ft_lock():
+            glyph = glyphs.get(key)
+            if glyph is None:
+                ft_face = get_ft_face(atlas["font_path"])
+                ft_face.set_char_size(0, atlas["px_size"] * 64, 72, 72)
+                if threshold is None:
+                    ft_face.load_glyph(gid, freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_MONO)
+                    pixels = mono_bitmap_bits(ft_face.glyph.bitmap)
+                else:
+                    ft_face.load_glyph(gid, freetype.FT_LOAD_RENDER)
+                    pixels = gray_bitmap(ft_face.glyph.bitmap)
+                slot = ft_face.glyph
+                pixels.flags.writeable = False
+                glyph = (slot.bitmap_left, slot.bitmap_top, slot.bitmap.width, pixels)
+                glyphs[key] = glyph
+
+    if threshold is None:
+        return glyph
+    left, top, width, coverage = glyph
+    bits = np.packbits(coverage >= threshold, axis=1)
+    bits.flags.writeable = False
+    return (left, top, width, bits)
 
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-def render_1bit_png_bytes(text, font_path, width, height, px_size=16, margin=0, align='center', text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+def _blit_all(canvas, bitmaps, offsets, pitches, heights, gxs, gys, order, group_starts):
     """
-    Render Tamil text as 1-bit PNG and return as bytes.
+    OR every packed glyph (flattened into `bitmaps`) onto the packed canvas with clipping.
+
+    Glyphs are visited band by band: order lists glyph indices grouped so that
+    group_starts[g]:group_starts[g + 1] never shares canvas rows with another
+    band, which lets the parallel build run bands on separate threads.
+    """
+    height, canvas_pitch = canvas.shape
+    for g in prange(group_starts.shape[0] - 1):
+        for j in range(group_starts[g], group_starts[g + 1]):
+            k = order[j]
+            pitch = pitches[k]
+            gy = gys[k]
+            # Glyph byte i lands on canvas bytes bx + i (high part) and bx + i + 1 (carry)
+            bx = gxs[k] >> 3
+            shift = gxs[k] & 7
+            y0 = max(0, gy)
+            y1 = min(height, gy + heights[k])
+            for y in range(y0, y1):
+                row = offsets[k] + (y - gy) * pitch
+                for i in range(pitch):
+                    b = bitmaps[row + i]
+                    if b == 0:
+                        continue
+                    x = bx + i
+                    if 0 <= x < canvas_pitch:
+                        canvas[y, x] |= b >> shift
+                    if shift and 0 <= x + 1 < canvas_pitch:
+                        canvas[y, x + 1] |= (b << (8 - shift)) & 0xFF
+
+def _blit_all_unclipped(canvas, bitmaps, offsets, pitches, heights, gxs, gys, order, group_starts):
+    """Same as _blit_all for glyphs whose pixels all lie inside the canvas."""
+    for g in prange(group_starts.shape[0] - 1):
+        for j in range(group_starts[g], group_starts[g + 1]):
+            k = order[j]
+            pitch = pitches[k]
+            gy = gys[k]
+            bx = gxs[k] >> 3
+            shift = gxs[k] & 7
+            for yy in range(heights[k]):
+                row = offsets[k] + yy * pitch
+                for i in range(pitch):
+                    b = bitmaps[row + i]
+                    # Only lit bits are written, so padding bytes never index past the canvas
+                    hi = b >> shift
+                    if hi:
+                        canvas[gy + yy, bx + i] |= hi
+                    lo = (b << (8 - shift)) & 0xFF
+                    if shift and lo:
+                        canvas[gy + yy, bx + i + 1] |= lo
+
+@st.cache_resource
+def _compiled_blit_kernels():
+    """
+    Compile the blit kernels once per process instead of on every Streamlit rerun.
+
+    Streamlit serves sessions from several threads, so the parallel kernels are
+    only built when Numba loads a thread-safe threading layer (TBB or OpenMP).
+    The workqueue fallback aborts the process on concurrent launches.
+
+    Returns:
+        dict: {(need_clip, parallel): compiled kernel}
+    """
+    kernels = {
+        (True, False): njit(nogil=True)(_blit_all),
+        (False, False): njit(nogil=True)(_blit_all_unclipped),
+    }
+    if numba_config.NUMBA_NUM_THREADS < 2:
+        return kernels
+
+    if numba_config.THREADING_LAYER not in ('tbb', 'omp', 'safe', 'threadsafe'):
+        numba_config.THREADING_LAYER = 'threadsafe'
+    try:
+        # Launches the threading layer, or fails if no thread-safe one is installed
+        set_num_threads(numba_config.NUMBA_NUM_THREADS)
+    except ValueError:
+        return kernels
+    if threading_layer() == 'workqueue':
+        return kernels
+
+    kernels[(True, True)] = njit(nogil=True, parallel=True)(_blit_all)
+    kernels[(False, True)] = njit(nogil=True, parallel=True)(_blit_all_unclipped)
+    return kernels
+
+def row_bands(gys, heights):
+    """
+    Group glyphs into bands whose row ranges do not overlap.
+
+    Returns:
+        tuple: (order, group_starts) where order sorts glyphs by top row and band
+        g is order[group_starts[g]:group_starts[g + 1]]
+    """
+    order = np.argsort(gys, kind='stable')
+    tops = gys[order]
+    bottoms = np.maximum.accumulate((gys + heights)[order])
+    # A new band starts at a glyph that begins below every glyph before it
+    starts = np.flatnonzero(tops[1:] >= bottoms[:-1]) + 1
+    group_starts = np.concatenate(([0], starts, [len(order)])).astype(np.int64)
+    return order.astype(np.int64), group_starts
+
+def new_canvas(width, height):
+    """Allocate a blank bit-packed canvas: one bit per pixel, rows padded to whole bytes."""
+    return np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+
+def blit_glyphs(canvas, width, glyph_bits, glyph_widths, gxs, gys):
+    """
+    Composite packed glyph bitmaps onto the packed canvas in place.
+
+    Args:
+        canvas: Bit-packed uint8 canvas from new_canvas
+        width: Canvas width in pixels
+        glyph_bits: List of packed glyph bitmaps as returned by render_glyph
+        glyph_widths: Width of each glyph in pixels
+        gxs: Left edge of each glyph on the canvas
+        gys: Top edge of each glyph on the canvas
+    """
+    if not glyph_bits:
+        return
+
+    height, canvas_pitch = canvas.shape
+    gxs = np.asarray(gxs, dtype=np.int32)
+    gys = np.asarray(gys, dtype=np.int32)
+    heights = np.array([bits.shape[0] for bits in glyph_bits], dtype=np.int32)
+    pitches = np.array([bits.shape[1] for bits in glyph_bits], dtype=np.int32)
+    widths = np.asarray(glyph_widths, dtype=np.int32)
+
+    # Usually the whole run fits, and the per-glyph clipping can be skipped
+    need_clip = (gxs.min() < 0 or gys.min() < 0
+                 or (gxs + widths).max() > width or (gys + heights).max() > height)
+
+    if NUMBA_AVAILABLE:
+        # Flatten the bitmaps into one buffer so the whole run is a single compiled call
+        bitmaps = np.concatenate([bits.ravel() for bits in glyph_bits])
+        sizes = heights.astype(np.int64) * pitches
+        offsets = np.cumsum(sizes) - sizes
+        order, group_starts = row_bands(gys, heights)
+
+        # Bands touch disjoint canvas rows, so several of them can be blitted in parallel
+        kernels = _compiled_blit_kernels()
+        num_threads = min(len(group_starts) - 1, numba_config.NUMBA_NUM_THREADS)
+        parallel = num_threads > 1 and (need_clip, True) in kernels
+        if parallel:
+            set_num_threads(num_threads)
+        blit = kernels[(need_clip, parallel)]
+        blit(canvas, bitmaps, offsets, pitches, heights, gxs, gys, order, group_starts)
+    else:
+        for bits, gx, gy, h, pitch in zip(glyph_bits, gxs, gys, heights, pitches):
+            y0 = max(0, gy)
+            y1 = min(height, gy + h)
+            if y0 >= y1:
+                continue
+            rows = bits[(y0 - gy):(y1 - gy)]
+
+            # Shift the glyph onto the canvas byte grid: high part and carry into the next byte
+            bx, shift = int(gx) >> 3, int(gx) & 7
+            parts = [(rows >> shift, bx)]
+            if shift:
+                parts.append((rows << (8 - shift), bx + 1))
+            for part, start in parts:
+                b0 = max(0, start)
+                b1 = min(canvas_pitch, start + pitch)
+                if b0 < b1:
+                    canvas[y0:y1, b0:b1] |= part[:, (b0 - start):(b1 - start)]
+
+    # Clear bits that spilled past the right edge into the row padding
+    if width % 8:
+        canvas[:, -1] &= (0xFF << (8 - width % 8)) & 0xFF
+
+def canvas_to_png_bytes(canvas, width, text_color=(255, 255, 255), bg_color=(0, 0, 0), fast=True):
+    """
+    Encode a bit-packed canvas as a 1-bit PNG.
+
+    Black-and-white output is written as bilevel grayscale; any other color
+    pair uses a two-entry palette.
+
+    Args:
+        canvas: Bit-packed uint8 canvas (set bits are text, clear bits background)
+        width: Canvas width in pixels
+        text_color: RGB tuple for text color
+        bg_color: RGB tuple for background color
+        fast: Encode with zlib level 1; False spends extra time (optimize=True)
+            for the smallest file
+
+    Returns:
+        bytes: PNG image data
+    """
+    # The packed canvas already is Pillow's native 1-bit row layout (MSB first)
+    size = (width, canvas.shape[0])
+    text_color, bg_color = tuple(text_color), tuple(bg_color)
+    if {text_color, bg_color} == {(255, 255, 255), (0, 0, 0)} and text_color != bg_color:
+        # Plain black and white: a bilevel grayscale PNG needs no palette
+        bits = canvas if text_color == (255, 255, 255) else np.invert(canvas)
+        img = Image.frombytes('1', size, bits.tobytes())
+    else:
+        img = Image.frombytes('P', size, canvas.tobytes(), 'raw', 'P;1')
+        img.putpalette(list(bg_color) + list(text_color))
+
+    # Convert to bytes
+    buf = io.BytesIO()
+    if fast:
+        img.save(buf, format='PNG', optimize=False, compress_level=1)
+    else:
+        img.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+def canvas_preview(canvas, width, scale, text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+    """
+    Build an RGB preview of a bit-packed canvas, upscaled by pixel replication.
+
+    Returns:
+        np.ndarray: uint8 array of shape (height * scale, width * scale, 3)
+    """
+    pixels = np.unpackbits(canvas, axis=1, count=width)
+    palette = np.array([bg_color, text_color], dtype=np.uint8)
+    return palette[np.repeat(np.repeat(pixels, scale, axis=0), scale, axis=1)]
+
+def place_glyphs(atlas, gids, pen_xs, baselines, threshold=None):
+    """
+    Fetch the packed bitmaps of a shaped run and compute their canvas positions.
+
+    Args:
+        atlas: Glyph atlas from glyph_atlas
+        gids: Glyph ids of the run
+        pen_xs: Pen x of every glyph, x offset included
+        baselines: Baseline y of every glyph, y offset included
+        threshold: Gray level (1-255) for antialiased rendering, or None for
+            FreeType's monochrome rasterizer
+
+    Returns:
+        tuple: (glyph_bits, glyph_widths, gxs, gys) for the non-empty glyphs
+    """
+    glyphs = [render_glyph(atlas, int(gid), threshold) for gid in gids]
+    bitmap_lefts = np.array([glyph[0] for glyph in glyphs], dtype=np.float64)
+    bitmap_tops = np.array([glyph[1] for glyph in glyphs], dtype=np.float64)
+
+    # np.rint rounds half to even, like the built-in round()
+    gxs = np.rint(pen_xs + bitmap_lefts).astype(np.int32)
+    gys = np.rint(baselines - bitmap_tops).astype(np.int32)
+
+    keep = [k for k, glyph in enumerate(glyphs) if glyph[3].size]
+    glyph_bits = [glyphs[k][3] for k in keep]
+    glyph_widths = [glyphs[k][2] for k in keep]
+    return glyph_bits, glyph_widths, gxs[keep], gys[keep]
+
+def render_canvas(text, font_path, width, height, px_size=16, margin=0, align='center', threshold=None):
+    """
+    Render Tamil text onto a 1-bit canvas.
     
     Args:
         text: Tamil text to render
@@ -97,34 +466,26 @@ def render_1bit_png_bytes(text, font_path, width, height, px_size=16, margin=0,
         px_size: Font size in pixels
         margin: Left/right margin in pixels
         align: Horizontal alignment ('left', 'center', 'right')
-        text_color: RGB tuple for text color
-        bg_color: RGB tuple for background color
+        threshold: Gray level (1-255) for antialiased rendering, or None for
+            FreeType's monochrome rasterizer
     
     Returns:
-        bytes: PNG image data
+        np.ndarray: Bit-packed uint8 canvas of shape (height, ceil(width / 8))
     """
     if not DEPENDENCIES_AVAILABLE:
         raise ImportError("Required dependencies (uharfbuzz, freetype-py) not available")
     
-    font_bytes = load_font_bytes(font_path)
-    
-    # FreeType face for rasterization & metrics
-    ft_face = freetype.Face(font_path)
-    ft_face.set_char_size(0, px_size * 64, 72, 72)
-
-    infos, positions, hb_face, hb_font = hb_shape(
-        text, font_bytes, script='taml', lang='ta', direction='LTR',
-        upem=ft_face.units_per_EM, px_size=px_size
+    gids, x_advances, x_offsets, y_offsets = shape_cached(
+        text, font_path, px_size=px_size, script='taml', lang='ta', direction='LTR'
     )
 
     # Compute baseline using FreeType size metrics
-    ascender = ft_face.size.ascender / 64.0
-    descender = ft_face.size.descender / 64.0
+    atlas = glyph_atlas(font_path, px_size)
+    ascender = atlas["ascender"]
+    descender = atlas["descender"]
 
     # Measure shaped run advance
-    x_advance_total = 0.0
-    for pos in positions:
-        x_advance_total += pos.x_advance / 64.0
+    x_advance_total = int(x_advances.sum()) / 64.0
 
     # Initial pen position based on alignment
     if align == 'left':
@@ -138,58 +499,24 @@ def render_1bit_png_bytes(text, font_path, width, height, px_size=16, margin=0,
     # Vertical position: center glyphs in available height
     baseline = (height + ascender - (-descender)) / 2.0
 
-    # Create 1-bit canvas
-    canvas = np.zeros((height, width), dtype=np.uint8)
-
-    for info, pos in zip(infos, positions):
-        gid = info.codepoint
-        x_advance = pos.x_advance / 64.0
-        x_offset = pos.x_offset / 64.0
-        y_offset = pos.y_offset / 64.0
-
-        # Load glyph with monochrome target
-        ft_face.load_glyph(gid, freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_MONO)
-        slot = ft_face.glyph
-        bmp = slot.bitmap
-        glyph_img = unpack_mono_bitmap(bmp)
-
-        # Position glyph
-        gx = int(round(pen_x + x_offset + slot.bitmap_left))
-        gy = int(round(baseline - y_offset - slot.bitmap_top))
-
-        # Blit with clipping
-        h, w = glyph_img.shape
-        if w == 0 or h == 0:
-            pen_x += x_advance
-            continue
-
-        x0 = max(0, gx)
-        y0 = max(0, gy)
-        x1 = min(width, gx + w)
-        y1 = min(height, gy + h)
+    # Pen x of every glyph: exclusive prefix sum of advances plus its offset,
+    # accumulated exactly in 26.6 fixed point and converted to pixels once
+    pen_xs = pen_x + (np.cumsum(x_advances) - x_advances + x_offsets) / 64.0
 
-        if x0 < x1 and y0 < y1:
-            sub = glyph_img[(y0 - gy):(y1 - gy), (x0 - gx):(x1 - gx)]
-            canvas[y0:y1, x0:x1] = np.maximum(canvas[y0:y1, x0:x1], sub)
+    # Packed glyph bitmaps, rasterized once per (font, size, glyph), and their positions
+    glyph_bits, glyph_widths, gxs, gys = place_glyphs(
+        atlas, gids, pen_xs, baseline - y_offsets / 64.0, threshold
+    )
 
-        pen_x += x_advance
+    # Create 1-bit canvas and blit with clipping
+    canvas = new_canvas(width, height)
+    blit_glyphs(canvas, width, glyph_bits, glyph_widths, gxs, gys)
 
-    # Convert to PIL image with specified colors
-    img = Image.new('RGB', (width, height), color=bg_color)
-    pixels = img.load()
-    for y in range(height):
-        for x in range(width):
-            if canvas[y, x] == 1:
-                pixels[x, y] = text_color
-    
-    # Convert to bytes
-    buf = io.BytesIO()
-    img.save(buf, format='PNG', optimize=True)
-    return buf.getvalue()
+    return canvas
 
-def render_multiline_text(text_lines, font_path, width, height, px_size=16, margin=0, align='center', line_spacing=2, text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+def render_multiline_canvas(text_lines, font_path, width, height, px_size=16, margin=0, align='center', line_spacing=2, threshold=None):
     """
-    Render multiple lines of Tamil text.
+    Render multiple lines of Tamil text onto a 1-bit canvas.
     
     Args:
         text_lines: List of text lines
@@ -200,49 +527,40 @@ def render_multiline_text(text_lines, font_path, width, height, px_size=16, marg
         margin: Left/right margin in pixels
         align: Horizontal alignment ('left', 'center', 'right')
         line_spacing: Additional spacing between lines in pixels
-        text_color: RGB tuple for text color
-        bg_color: RGB tuple for background color
+        threshold: Gray level (1-255) for antialiased rendering, or None for
+            FreeType's monochrome rasterizer
     
     Returns:
-        bytes: PNG image data
+        np.ndarray: Bit-packed uint8 canvas of shape (height, ceil(width / 8))
     """
     if not DEPENDENCIES_AVAILABLE:
         raise ImportError("Required dependencies (uharfbuzz, freetype-py) not available")
     
-    font_bytes = load_font_bytes(font_path)
-    
-    # Initialize FreeType face once for metrics
-    ft_face_metrics = freetype.Face(font_path)
-    ft_face_metrics.set_char_size(0, px_size * 64, 72, 72)
-    ascender = ft_face_metrics.size.ascender / 64.0
-    descender = ft_face_metrics.size.descender / 64.0
+    # FreeType size metrics for line layout
+    atlas = glyph_atlas(font_path, px_size)
+    ascender = atlas["ascender"]
+    descender = atlas["descender"]
     line_height_calc = ascender - descender + line_spacing
     
     # Create main canvas
-    canvas = np.zeros((height, width), dtype=np.uint8)
+    canvas = new_canvas(width, height)
     
     # Calculate total text height and starting Y to center all lines vertically
     total_text_content_height = len(text_lines) * line_height_calc - line_spacing
     start_y_overall = (height - total_text_content_height) / 2.0
-    
+
+    glyph_bits, glyph_widths, gxs, gys = [], [], [], []
     for i, line in enumerate(text_lines):
         if not line.strip():  # Skip empty lines
             continue
             
         # Shape each line independently
-        infos, positions, hb_face_line, hb_font_line = hb_shape(
-            line, font_bytes, script='taml', lang='ta', direction='LTR',
-            upem=ft_face_metrics.units_per_EM, px_size=px_size
+        gids, x_advances, x_offsets, y_offsets = shape_cached(
+            line, font_path, px_size=px_size, script='taml', lang='ta', direction='LTR'
         )
 
-        # FreeType face for rasterization for this line
-        ft_face_line_render = freetype.Face(font_path)
-        ft_face_line_render.set_char_size(0, px_size * 64, 72, 72)
-
         # Measure shaped run advance for this line
-        x_advance_total_line = 0.0
-        for pos in positions:
-            x_advance_total_line += pos.x_advance / 64.0
+        x_advance_total_line = int(x_advances.sum()) / 64.0
 
         # Calculate pen position for this line based on alignment
         if align == 'left':
@@ -257,49 +575,59 @@ def render_multiline_text(text_lines, font_path, width, height, px_size=16, marg
         current_line_y_offset = start_y_overall + i * line_height_calc
         baseline = current_line_y_offset + ascender
 
-        # Render glyphs for this line onto the main canvas
-        for info, pos in zip(infos, positions):
-            gid = info.codepoint
-            x_advance = pos.x_advance / 64.0
-            x_offset = pos.x_offset / 64.0
-            y_offset = pos.y_offset / 64.0
+        pen_xs = pen_x + (np.cumsum(x_advances) - x_advances + x_offsets) / 64.0
 
-            ft_face_line_render.load_glyph(gid, freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_MONO)
-            slot = ft_face_line_render.glyph
-            bmp = slot.bitmap
-            glyph_img = unpack_mono_bitmap(bmp)
+        # Collect glyphs for this line; all lines are blitted in one pass
+        line_bits, line_widths, line_gxs, line_gys = place_glyphs(
+            atlas, gids, pen_xs, baseline - y_offsets / 64.0, threshold
+        )
+        glyph_bits.extend(line_bits)
+        glyph_widths.extend(line_widths)
+        gxs.extend(line_gxs)
+        gys.extend(line_gys)
 
-            gx = int(round(pen_x + x_offset + slot.bitmap_left))
-            gy = int(round(baseline - y_offset - slot.bitmap_top))
+    blit_glyphs(canvas, width, glyph_bits, glyph_widths, gxs, gys)
 
-            h, w = glyph_img.shape
-            if w == 0 or h == 0:
-                pen_x += x_advance
-                continue
+    return canvas
 
-            x0 = max(0, gx)
-            y0 = max(0, gy)
-            x1 = min(width, gx + w)
-            y1 = min(height, gy + h)
+def render_1bit_png_bytes(text, font_path, width, height, px_size=16, margin=0, align='center', text_color=(255, 255, 255), bg_color=(0, 0, 0), threshold=None, fast=True):
+    """
+    Render Tamil text as 1-bit PNG and return as bytes.
 
-            if x0 < x1 and y0 < y1:
-                sub = glyph_img[(y0 - gy):(y1 - gy), (x0 - gx):(x1 - gx)]
-                canvas[y0:y1, x0:x1] = np.maximum(canvas[y0:y1, x0:x1], sub)
+    Takes the arguments of render_canvas plus text_color and bg_color RGB
+    tuples and the fast flag of canvas_to_png_bytes.
 
-            pen_x += x_advance
+    Returns:
+        bytes: PNG image data
+    """
+    canvas = render_canvas(text, font_path, width, height, px_size=px_size, margin=margin,
+                           align=align, threshold=threshold)
+    return canvas_to_png_bytes(canvas, width, text_color, bg_color, fast=fast)
 
-    # Convert to PIL image with specified colors
-    img = Image.new('RGB', (width, height), color=bg_color)
-    pixels = img.load()
-    for y in range(height):
-        for x in range(width):
-            if canvas[y, x] == 1:
-                pixels[x, y] = text_color
-    
-    # Convert to bytes
-    buf = io.BytesIO()
-    img.save(buf, format='PNG', optimize=True)
-    return buf.getvalue()
+def render_multiline_text(text_lines, font_path, width, height, px_size=16, margin=0, align='center', line_spacing=2, text_color=(255, 255, 255), bg_color=(0, 0, 0), threshold=None, fast=True):
+    """
+    Render multiple lines of Tamil text as 1-bit PNG and return as bytes.
+
+    Takes the arguments of render_multiline_canvas plus text_color and bg_color
+    RGB tuples and the fast flag of canvas_to_png_bytes.
+
+    Returns:
+        bytes: PNG image data
+    """
+    canvas = render_multiline_canvas(text_lines, font_path, width, height, px_size=px_size, margin=margin,
+                                     align=align, line_spacing=line_spacing, threshold=threshold)
+    return canvas_to_png_bytes(canvas, width, text_color, bg_color, fast=fast)
+
+@st.cache_data(max_entries=32)
+def png_for_download(canvas_bytes, width, height, text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+    """
+    Encode the download PNG from raw canvas bytes, optimized for size.
+
+    Keyed on the exact canvas bytes, so reruns that only touch the preview
+    (e.g. the scale slider) skip PNG encoding entirely.
+    """
+    canvas = np.frombuffer(canvas_bytes, dtype=np.uint8).reshape(height, -1)
+    return canvas_to_png_bytes(canvas, width, text_color, bg_color, fast=False)
 
 # Streamlit App Configuration
 st.set_page_config(
@@ -453,6 +781,15 @@ with st.sidebar:
     selected_font_path = available_families[selected_family][selected_weight]
     
     font_size = st.slider("Font Size (pixels)", min_value=8, max_value=64, value=16, step=1)
+
+    rasterization = st.selectbox(
+        "Rasterization", ["Monochrome (hinted)", "Grayscale threshold"],
+        help="Grayscale threshold renders antialiased glyphs and lights every pixel at or above the threshold"
+    )
+    threshold = None
+    if rasterization == "Grayscale threshold":
+        threshold = st.slider("Threshold", min_value=1, max_value=255, value=128, step=1,
+                              help="Lower values give bolder strokes, higher values thinner ones")
     
     # Color Options
     st.subheader("Color Options")
@@ -540,23 +877,20 @@ with col2:
         try:
             # Generate image
             if len(text_lines) == 1:
-                image_bytes = render_1bit_png_bytes(
+                canvas = render_canvas(
                     text_lines[0], selected_font_path, width, height,
-                    px_size=font_size, margin=margin, align=alignment,
-                    text_color=text_color_rgb, bg_color=bg_color_rgb
+                    px_size=font_size, margin=margin, align=alignment, threshold=threshold
                 )
             else:
-                image_bytes = render_multiline_text(
+                canvas = render_multiline_canvas(
                     text_lines, selected_font_path, width, height,
                     px_size=font_size, margin=margin, align=alignment,
-                    line_spacing=line_spacing, text_color=text_color_rgb, bg_color=bg_color_rgb
+                    line_spacing=line_spacing, threshold=threshold
                 )
             
-            # Display image
-            img = Image.open(io.BytesIO(image_bytes))
-            
-            # Scale for preview
-            preview_img = img.resize((width * preview_scale, height * preview_scale), Image.NEAREST)
+            # Scale for preview straight from the canvas; the PNG is only for download
+            preview_img = canvas_preview(canvas, width, preview_scale, text_color_rgb, bg_color_rgb)
+            image_bytes = png_for_download(canvas.tobytes(), width, height, text_color_rgb, bg_color_rgb)
             
             st.image(
                 preview_img,